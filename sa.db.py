@@ -1,7 +1,10 @@
 from sa_model import Base, Game, Player, GameBoard, PlayerType
 from sqlalchemy import create_engine, select
 from sqlalchemy.orm import Session
+from sa_export import export_actions, export_players, load_npz, MISSING_POSITION, np
+import csv
 import os
+import tempfile
 import logging
 
 # Configuration du logging
@@ -197,4 +200,54 @@ if __name__ == '__main__':
             player = next((p for p in game.players if p.id == action.player_id), None)
             player_name = player.pseudo if player else "Inconnu"
             symbol = "W" if player and player.player_type == PlayerType.WOLF else "O"
-            logger.info(f"Joueur {player_name} ({symbol}) a effectué mouvement ({action.delta_x}, {action.delta_y})")
\ No newline at end of file
+            logger.info(f"Joueur {player_name} ({symbol}) a effectué mouvement ({action.delta_x}, {action.delta_y})")
+
+        # Test de l'export en flux
+        logger.info("\nTest de l'export des actions et des joueurs:")
+        export_dir = tempfile.mkdtemp()
+        nb_actions = len(game.action_records)
+
+        csv_path = export_actions(session, os.path.join(export_dir, 'actions.csv'), game_id=game.id, chunk_size=1)
+        with open(csv_path, newline='') as handle:
+            rows = list(csv.DictReader(handle))
+        assert len(rows) == nb_actions
+        assert [(int(r['delta_x']), int(r['delta_y'])) for r in rows] == \
+            [(a.delta_x, a.delta_y) for a in game.action_records]
+        logger.info(f"Export CSV des actions: {len(rows)} lignes")
+
+        players_path = export_players(session, os.path.join(export_dir, 'players.csv'), game_id=game.id, chunk_size=3)
+        with open(players_path, newline='') as handle:
+            rows = list(csv.DictReader(handle))
+        assert [r['player_type'] for r in rows] == [p.player_type.value for p in game.players]
+
+        # Un chunk_size invalide ne doit pas écraser un export existant
+        try:
+            export_actions(session, csv_path, chunk_size=0)
+        except ValueError:
+            with open(csv_path, newline='') as handle:
+                assert len(list(csv.DictReader(handle))) == nb_actions
+            logger.info("chunk_size invalide refusé, export existant intact.")
+        else:
+            raise AssertionError("chunk_size=0 aurait dû être refusé")
+
+        if np is not None:
+            npz_path = export_actions(session, os.path.join(export_dir, 'actions.npz'), game_id=game.id, chunk_size=1)
+            columns = load_npz(npz_path)
+            assert columns['delta_x'].tolist() == [a.delta_x for a in game.action_records]
+            assert columns['player_id'].tolist() == [a.player_id for a in game.action_records]
+
+            # Un joueur non positionné est exporté avec MISSING_POSITION
+            game.players.append(Player(pseudo='Z', player_type=PlayerType.VILLAGER, field_distance=1))
+            session.flush()
+            npz_path = export_players(session, os.path.join(export_dir, 'players.npz'), game_id=game.id, chunk_size=2)
+            columns = load_npz(npz_path)
+            assert len(columns['id']) == len(game.players)
+            assert columns['player_type'].tolist() == [p.player_type.value for p in game.players]
+            assert columns['position_x'][-1] == MISSING_POSITION
+            session.rollback()
+
+            # Une partie sans données donne des colonnes vides mais typées
+            columns = load_npz(export_actions(session, os.path.join(export_dir, 'empty.npz'), game_id=-1))
+            assert set(columns) == {'id', 'game_id', 'player_id', 'delta_x', 'delta_y'}
+            assert all(len(c) == 0 and c.dtype == np.int64 for c in columns.values())
+            logger.info("Export NumPy vérifié.")
@@ -0,0 +1,204 @@
+import csv
+import logging
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sa_model import GameAction, Player, PlayerType
+
+try:
+    import numpy as np
+except ImportError:  # numpy est optionnel : repli sur le CSV
+    np = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 10000
+
+# Valeur utilisée dans les tableaux NumPy pour une position absente (NULL en base).
+MISSING_POSITION = -1
+
+ACTION_COLUMNS: Tuple[str, ...] = ('id', 'game_id', 'player_id', 'delta_x', 'delta_y')
+PLAYER_COLUMNS: Tuple[str, ...] = (
+    'id', 'game_id', 'pseudo', 'player_type', 'field_distance', 'position_x', 'position_y'
+)
+
+
+def _action_select(game_id: Optional[int] = None):
+    stmt = select(
+        GameAction.id,
+        GameAction.game_id,
+        GameAction.player_id,
+        GameAction.delta_x,
+        GameAction.delta_y,
+    ).order_by(GameAction.id)
+    if game_id is not None:
+        stmt = stmt.where(GameAction.game_id == game_id)
+    return stmt
+
+
+def _player_select(game_id: Optional[int] = None):
+    stmt = select(
+        Player.id,
+        Player.game_id,
+        Player.pseudo,
+        Player.player_type,
+        Player.field_distance,
+        Player.position_x,
+        Player.position_y,
+    ).order_by(Player.id)
+    if game_id is not None:
+        stmt = stmt.where(Player.game_id == game_id)
+    return stmt
+
+
+def _check_chunk_size(chunk_size: int):
+    if chunk_size <= 0:
+        raise ValueError('chunk_size must be positive')
+
+
+def _stream(session: Session, stmt, chunk_size: int) -> Iterator[List[tuple]]:
+    """Exécute une requête Core en flux et renvoie les lignes par paquets de `chunk_size`."""
+    result = session.execute(
+        stmt,
+        execution_options={'yield_per': chunk_size, 'stream_results': True},
+    )
+    try:
+        for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+    finally:
+        result.close()
+
+
+def stream_actions(session: Session, game_id: Optional[int] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[tuple]]:
+    """Parcourt l'historique des actions par paquets, sans charger d'objets ORM."""
+    _check_chunk_size(chunk_size)
+    return _stream(session, _action_select(game_id), chunk_size)
+
+
+def stream_players(session: Session, game_id: Optional[int] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[tuple]]:
+    """Parcourt les joueurs et leurs positions finales par paquets."""
+    _check_chunk_size(chunk_size)
+    return (
+        [row[:3] + (row[3].value if isinstance(row[3], PlayerType) else row[3],) + row[4:] for row in chunk]
+        for chunk in _stream(session, _player_select(game_id), chunk_size)
+    )
+
+
+def _columns(chunk: Sequence[tuple], names: Sequence[str]):
+    """Transpose un paquet en colonnes ; un paquet vide donne des colonnes vides."""
+    if not chunk:
+        return dict.fromkeys(names, ())
+    return dict(zip(names, zip(*chunk)))
+
+
+def _action_arrays(chunk: Sequence[tuple]):
+    columns = _columns(chunk, ACTION_COLUMNS)
+    return {name: np.asarray(columns[name], dtype=np.int64) for name in ACTION_COLUMNS}
+
+
+def _player_arrays(chunk: Sequence[tuple]):
+    columns = _columns(chunk, PLAYER_COLUMNS)
+    arrays = {}
+    for name in PLAYER_COLUMNS:
+        values = columns[name]
+        if name in ('pseudo', 'player_type'):
+            arrays[name] = np.asarray(values, dtype=np.str_)
+        elif name in ('position_x', 'position_y'):
+            arrays[name] = np.asarray(
+                [MISSING_POSITION if v is None else v for v in values], dtype=np.int64
+            )
+        else:
+            arrays[name] = np.asarray(values, dtype=np.int64)
+    return arrays
+
+
+def _write_npz(path: Path, chunks: Iterator[List[tuple]], to_arrays) -> int:
+    """
+    Écrit chaque paquet dans l'archive sous les clés `<colonne>_<numéro de paquet>`.
+    Les tableaux sont écrits directement dans le zip : un seul paquet est en mémoire à la fois.
+    Sans aucune ligne, le paquet 0 contient des tableaux vides typés pour chaque colonne.
+    """
+    total = 0
+    index = 0
+    with zipfile.ZipFile(path, mode='w', compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for chunk in chunks:
+            if not chunk:
+                continue
+            _write_chunk(archive, index, to_arrays(chunk))
+            index += 1
+            total += len(chunk)
+        if index == 0:
+            _write_chunk(archive, 0, to_arrays([]))
+    return total
+
+
+def _write_chunk(archive: zipfile.ZipFile, index: int, arrays):
+    for name, array in arrays.items():
+        with archive.open(f'{name}_{index:05d}.npy', mode='w', force_zip64=True) as entry:
+            np.lib.format.write_array(entry, array, allow_pickle=False)
+
+
+def _write_csv(path: Path, chunks: Iterator[List[tuple]], header: Sequence[str]) -> int:
+    total = 0
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(header)
+        for chunk in chunks:
+            writer.writerows(chunk)
+            total += len(chunk)
+    return total
+
+
+def _export(path: Union[str, Path], chunks: Iterator[List[tuple]], header: Sequence[str], to_arrays) -> Path:
+    path = Path(path)
+    if path.suffix == '.npz':
+        if np is None:
+            path = path.with_suffix('.csv')
+            logger.warning(f"NumPy n'est pas installé : export CSV vers {path}")
+        else:
+            total = _write_npz(path, chunks, to_arrays)
+            logger.info(f"{total} lignes exportées vers {path}")
+            return path
+    elif path.suffix != '.csv':
+        raise ValueError(f"Unsupported export format '{path.suffix}': expected .npz or .csv")
+
+    total = _write_csv(path, chunks, header)
+    logger.info(f"{total} lignes exportées vers {path}")
+    return path
+
+
+def export_actions(session: Session, path: Union[str, Path], game_id: Optional[int] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> Path:
+    """
+    Exporte l'historique des actions vers `path` (.npz ou .csv) et renvoie le chemin écrit.
+    Si NumPy est absent, un fichier .csv est produit à la place du .npz.
+    """
+    return _export(path, stream_actions(session, game_id, chunk_size), ACTION_COLUMNS, _action_arrays)
+
+
+def export_players(session: Session, path: Union[str, Path], game_id: Optional[int] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> Path:
+    """
+    Exporte les joueurs et leurs positions finales vers `path` (.npz ou .csv).
+    Dans le .npz, une position absente vaut MISSING_POSITION.
+    """
+    return _export(path, stream_players(session, game_id, chunk_size), PLAYER_COLUMNS, _player_arrays)
+
+
+def load_npz(path: Union[str, Path]) -> Dict[str, "np.ndarray"]:
+    """Relit un export .npz et reconstitue chaque colonne en concaténant ses paquets dans l'ordre."""
+    if np is None:
+        raise ImportError('numpy is required to load .npz exports')
+    chunks: Dict[str, List[Tuple[int, str]]] = {}
+    with np.load(path, allow_pickle=False) as archive:
+        for key in archive.files:
+            name, _, index = key.rpartition('_')
+            chunks.setdefault(name, []).append((int(index), key))
+        return {
+            name: np.concatenate([archive[key] for _, key in sorted(keys)])
+            for name, keys in chunks.items()
+        }